@@ -1,4 +1,10 @@
 """This package provides python parsers for different NASA API.
 
 All parsers are located inside the `parsers` sub-package.
+Other modules work on the parsed data:
+
+- `figures` computes the figures and provides helpers to export them.
+- `index` provides an index to query fireballs by location and date.
+- `crossmatch` correlates fireballs with asteroid close approaches.
+- `server` answers queries over the datasets kept in memory (`badaboom serve`).
 """
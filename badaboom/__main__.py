@@ -0,0 +1,56 @@
+"""Command line interface of badaboom.
+
+Usage: `python -m badaboom serve --api_key <your key>` (or `badaboom serve` once installed).
+"""
+
+import argparse
+
+from badaboom.parsers.asteroids import AsteroidDatasetParser
+from badaboom.server import DatasetStore, serve
+
+
+def main() -> None:
+    """Parse the command line arguments and run the selected command."""
+    parser = argparse.ArgumentParser(prog="badaboom", description="Badaboom command line.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Keep the asteroid and fireball datasets in memory and answer queries over HTTP.",
+    )
+    serve_parser.add_argument(
+        "--api_key",
+        type=str,
+        help="Your API key provided by NASA, see https://api.nasa.gov/ for more details.",
+    )
+    serve_parser.add_argument(
+        "--local_neo_feed_datapath",
+        type=str,
+        default="neo_feed_data.csv",
+        help="Path where the events dataframe is saved/loaded.",
+    )
+    serve_parser.add_argument(
+        "--local_asteroid_datapath",
+        type=str,
+        default="asteroid_data.csv",
+        help="Path where the asteroids dataframe is saved/loaded.",
+    )
+    serve_parser.add_argument("--host", type=str, default="127.0.0.1", help="Address to listen on.")
+    serve_parser.add_argument("--port", type=int, default=8000, help="Port to listen on.")
+    serve_parser.add_argument(
+        "--refresh_interval",
+        type=float,
+        default=3600,
+        help="Number of seconds between two refreshes of the datasets.",
+    )
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        adp = AsteroidDatasetParser(
+            args.api_key, args.local_neo_feed_datapath, args.local_asteroid_datapath
+        )
+        serve(DatasetStore(adp), args.host, args.port, args.refresh_interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Module providing functions to correlate fireballs with asteroid close approaches.
+
+Both datasets are time-aligned with sorted windows instead of a cross join, so the cost is
+O(n log n) plus the number of returned pairs.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def _match_chunk(
+    df_fireballs: pd.DataFrame,
+    fireball_dates: np.ndarray,
+    df_neo_feed: pd.DataFrame,
+    window: pd.Timedelta | str,
+) -> pd.DataFrame:
+    """Return the pairs between all fireballs and the close approaches of one feed chunk."""
+    df_neo_feed = df_neo_feed.sort_values("date", kind="stable")
+    approach_dates = df_neo_feed["date"].to_numpy(dtype="datetime64[ns]")
+    window = pd.Timedelta(window).to_timedelta64()
+
+    # range of close approaches inside the window of each fireball
+    first_rows = np.searchsorted(approach_dates, fireball_dates - window, side="left")
+    last_rows = np.searchsorted(approach_dates, fireball_dates + window, side="right")
+    counts = last_rows - first_rows
+
+    fireball_rows = np.repeat(np.arange(len(fireball_dates)), counts)
+    approach_rows = (
+        np.arange(counts.sum())
+        - np.repeat(np.cumsum(counts) - counts, counts)
+        + np.repeat(first_rows, counts)
+    )
+
+    df_pairs = df_fireballs.iloc[fireball_rows].reset_index(drop=True)
+    df_approaches = (
+        df_neo_feed.iloc[approach_rows]
+        .rename(columns={"date": "approach_date"})
+        .reset_index(drop=True)
+    )
+    return pd.concat([df_pairs, df_approaches], axis=1)
+
+
+def match_fireballs_to_close_approaches(
+    df_fireballs: pd.DataFrame,
+    neo_feed: pd.DataFrame | Iterable[pd.DataFrame],
+    df_asteroids: pd.DataFrame | None = None,
+    window: pd.Timedelta | str = "1D",
+    max_miss_distance: float | None = None,
+) -> pd.DataFrame:
+    """Return candidate pairs of fireballs and asteroid close approaches close in time.
+
+    Dates of the 'Asteroids - NeoWs' feed are days (at midnight) while fireball dates are precise,
+    hence the default window of one day.
+
+    Parameters
+    ----------
+    df_fireballs : pd.DataFrame
+        Dataframe returned by `gather_fireball_data`.
+    neo_feed : pd.DataFrame | Iterable[pd.DataFrame]
+        Close approach events, as in `AsteroidDatasetParser.df_neo_feed`. An iterable of
+        dataframes can also be given to match the feed chunk by chunk (e.g. one year at a time),
+        for instance `(adp.retrieve_year_dataframe(year, refresh_estimations=False)[0] for year
+        in years)`, which does not download years already known locally.
+    df_asteroids : pd.DataFrame | None, optional
+        Asteroids information, as in `AsteroidDatasetParser.df_asteroids`. If given, asteroid
+        attributes are joined to the pairs using the asteroid ID, by default None
+    window : pd.Timedelta | str, optional
+        Maximum absolute time delta between a fireball and a close approach, by default "1D"
+    max_miss_distance : float | None, optional
+        If set, only keep close approaches with a miss distance (in kilometers) at most equal
+        to it, by default None
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per candidate pair with the fireball columns (its date renamed `fireball_date`),
+        the close approach columns (its date renamed `approach_date`), the asteroid columns if
+        df_asteroids is given, and a `time_delta` column (fireball_date - approach_date).
+        Rows are sorted by fireball date then by absolute time delta.
+    """
+    if isinstance(neo_feed, pd.DataFrame):
+        neo_feed = [neo_feed]
+
+    df_fireballs = df_fireballs.rename(columns={"date": "fireball_date"})
+    fireball_dates = df_fireballs["fireball_date"].to_numpy(dtype="datetime64[ns]")
+
+    chunks = []
+    for df_neo_feed in neo_feed:
+        if max_miss_distance is not None:
+            df_neo_feed = df_neo_feed[df_neo_feed["miss_distance"] <= max_miss_distance]
+        chunks.append(_match_chunk(df_fireballs, fireball_dates, df_neo_feed, window))
+
+    if len(chunks) > 0:
+        df_pairs = pd.concat(chunks, ignore_index=True)
+    else:
+        df_empty_feed = pd.DataFrame(
+            {"date": pd.to_datetime([]), "asteroid_id": pd.Series([], dtype=int)}
+        )
+        df_pairs = _match_chunk(df_fireballs, fireball_dates, df_empty_feed, window)
+
+    if df_asteroids is not None:
+        asteroid_columns = ["asteroid_id"] + [
+            column for column in df_asteroids.columns if column not in df_pairs.columns
+        ]
+        df_pairs = df_pairs.merge(df_asteroids[asteroid_columns], on="asteroid_id", how="left")
+
+    df_pairs["time_delta"] = df_pairs["fireball_date"] - df_pairs["approach_date"]
+    return (
+        df_pairs.assign(_abs_delta=df_pairs["time_delta"].abs())
+        .sort_values(["fireball_date", "_abs_delta"], kind="stable")
+        .drop(columns="_abs_delta")
+        .reset_index(drop=True)
+    )
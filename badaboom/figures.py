@@ -0,0 +1,298 @@
+"""Module providing the figures computed from NASA data and helpers to export them.
+
+All figures of a run are written next to a single shared plotly.js bundle instead of
+embedding it in every HTML file.
+"""
+
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from os.path import exists, join
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+
+from badaboom.parsers.fireballs import add_signed_coordinates
+
+
+def _write_text(path: str, text: str, compress: bool) -> str:
+    """Write text to path, gzip compressed if required, and return the written path."""
+    if compress:
+        path = f"{path}.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    return path
+
+
+def export_figures(
+    figures: dict[str, go.Figure],
+    folder_results: str = ".",
+    compress: bool = False,
+    max_workers: int | None = None,
+    plotlyjs_filename: str = "plotly.min.js",
+) -> list[str]:
+    """Write all figures of a run concurrently as HTML files sharing one plotly.js bundle.
+
+    The plotly.js bundle is written once in `folder_results` and every HTML file references
+    it through a relative `<script src=...>`, so the folder can be moved or uploaded as a whole.
+
+    Parameters
+    ----------
+    figures : dict[str, go.Figure]
+        Figures to export indexed by their filename, without the ".html" extension.
+    folder_results : str, optional
+        Folder where the figures and the plotly.js bundle will be written, by default "."
+    compress : bool, optional
+        If True, every file is gzip compressed and gets an additional ".gz" extension,
+        by default False. HTML files still reference the uncompressed bundle name, this mode
+        is meant for storage or for web servers serving precompressed files
+        (e.g. nginx `gzip_static`).
+    max_workers : int | None, optional
+        Maximum number of figures written in parallel, by default None (see ThreadPoolExecutor).
+    plotlyjs_filename : str, optional
+        Filename of the shared plotly.js bundle, by default "plotly.min.js"
+
+    Returns
+    -------
+    list[str]
+        Paths of the written files, the plotly.js bundle first then figures in input order.
+    """
+    if not exists(folder_results):
+        os.makedirs(folder_results)
+
+    written_files = [_write_text(join(folder_results, plotlyjs_filename), get_plotlyjs(), compress)]
+
+    def _export(filename: str, fig: go.Figure) -> str:
+        html = fig.to_html(include_plotlyjs=plotlyjs_filename, full_html=True)
+        return _write_text(join(folder_results, f"{filename}.html"), html, compress)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        written_files.extend(executor.map(_export, figures.keys(), figures.values()))
+
+    return written_files
+
+
+def asteroid_year_statistics(
+    year_neo_feed_df: pd.DataFrame, year_asteroid_df: pd.DataFrame
+) -> dict[str, float]:
+    """Compute the statistics of one year of the 'Asteroids - NeoWs' database.
+
+    Parameters
+    ----------
+    year_neo_feed_df : pd.DataFrame
+        Events of the year, as returned by `AsteroidDatasetParser.retrieve_year_dataframe`.
+    year_asteroid_df : pd.DataFrame
+        Asteroids of the year, as returned by `AsteroidDatasetParser.retrieve_year_dataframe`.
+
+    Returns
+    -------
+    dict[str, float]
+        Number of unique asteroids and events, minimum miss distance, number of potentially
+        hazardous events and number of asteroids per size category.
+    """
+    diameter_max = year_asteroid_df["estimated_diameter_max"]
+    return {
+        "nunique_asteroids": year_neo_feed_df["asteroid_id"].nunique(),
+        "nunique_events": year_neo_feed_df.shape[0],
+        "min_distance": year_neo_feed_df["miss_distance"].min(),
+        "potentially_hazardous_events": year_neo_feed_df["is_potentially_hazardous_asteroid"].sum(),
+        "small_asteroids": int((diameter_max < 0.1).sum()),
+        "medium_asteroids": int(((diameter_max >= 0.1) & (diameter_max < 0.5)).sum()),
+        "big_asteroids": int(((diameter_max >= 0.5) & (diameter_max < 1.0)).sum()),
+        "enormous_asteroids": int(((diameter_max >= 1.0) & (diameter_max < 2.0)).sum()),
+        "gigantic_asteroids": int((diameter_max >= 2.0).sum()),
+    }
+
+
+def asteroid_events_figure(df_statistics: pd.DataFrame) -> go.Figure:
+    """Create the figure of the unique events and asteroids per year.
+
+    Parameters
+    ----------
+    df_statistics : pd.DataFrame
+        Statistics returned by `asteroid_year_statistics` indexed by year.
+
+    Returns
+    -------
+    go.Figure
+        Grouped bar figure.
+    """
+    today_timestamp = pd.Timestamp.today()
+
+    # Creating the figure
+    fig = go.Figure()
+
+    # Adding bars for the number of unique events per year
+    fig.add_trace(
+        go.Bar(
+            x=df_statistics.index,
+            y=df_statistics["nunique_events"],
+            name="Number of unique events per year",
+            marker_color="firebrick",
+        )
+    )
+
+    # Adding bars for the number of unique asteroids per year
+    fig.add_trace(
+        go.Bar(
+            x=df_statistics.index,
+            y=df_statistics["nunique_asteroids"],
+            name="Number of unique asteroids per year",
+            marker_color="grey",
+        )
+    )
+
+    # Updating the layout
+    fig.update_layout(
+        title=f"Past and future asteroids events. Produced on {today_timestamp.date()}",
+        xaxis=dict(title="Years"),
+        yaxis=dict(title="Count"),
+        barmode="group",
+        bargap=0.15,  # Gap between bars of adjacent location coordinates.
+        bargroupgap=0.1,  # Gap between bars of the same location coordinates.
+        legend=dict(x=0.1, y=1.1, orientation="h"),
+    )
+    return fig
+
+
+def asteroid_size_figure(df_statistics: pd.DataFrame) -> go.Figure:
+    """Create the figure of the number of asteroids per size category and per year.
+
+    Parameters
+    ----------
+    df_statistics : pd.DataFrame
+        Statistics returned by `asteroid_year_statistics` indexed by year.
+
+    Returns
+    -------
+    go.Figure
+        Stacked bar figure.
+    """
+    today_timestamp = pd.Timestamp.today()
+
+    # Creating the figure
+    fig = go.Figure()
+
+    # Adding stacked bars
+    for column, name, color in (
+        ("small_asteroids", "Asteroids with max diameter < 100m", "grey"),
+        ("medium_asteroids", "Asteroids with max diameter ≥ 100m and < 500m", "firebrick"),
+        ("big_asteroids", "Asteroids with max diameter ≥ 500m and < 1km", "blue"),
+        ("enormous_asteroids", "Asteroids with max diameter ≥ 1km and < 2km", "black"),
+        ("gigantic_asteroids", "Asteroids with max diameter ≥ 2km", "red"),
+    ):
+        fig.add_trace(
+            go.Bar(x=df_statistics.index, y=df_statistics[column], name=name, marker_color=color)
+        )
+
+    # Updating the layout
+    fig.update_layout(
+        title="Past and future asteroids events sorted by size."
+        f" Produced on {today_timestamp.date()}",
+        xaxis=dict(title="Years"),
+        yaxis=dict(title="Count"),
+        barmode="stack",
+        legend=dict(x=0.1, y=1.1, orientation="h"),
+        hovermode="x unified",
+    )
+    return fig
+
+
+def fireball_figures(df: pd.DataFrame) -> dict[str, go.Figure]:
+    """Create the distribution figures of the fireballs.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe returned by `gather_fireball_data`.
+
+    Returns
+    -------
+    dict[str, go.Figure]
+        Energy and impact energy histograms, fireballs per year and fireballs without location
+        per year, indexed by their filename.
+    """
+    # Energy distribution plot
+    fig_energy = px.histogram(
+        np.log(df["energy"]), nbins=30, labels={"value": "log(GJ)"}, title="Energy distribution."
+    )
+    fig_energy.update_layout(xaxis_title="log(GJ)", yaxis_title="Occurrences", width=1350)
+
+    # Impact energy distribution plot
+    fig_impact_energy = px.histogram(
+        np.log(df["impact-e"]),
+        nbins=40,
+        labels={"value": "log(kt)"},
+        title="Impact energy distribution.",
+    )
+    fig_impact_energy.update_layout(xaxis_title="log(kt)", yaxis_title="Occurrences", width=1350)
+
+    # Number of fireballs detected per year
+    fireballs_per_year = df.groupby(df["date"].dt.year)["date"].count()
+    fig_year = px.bar(
+        fireballs_per_year,
+        labels={"index": "year", "value": "Occurrences"},
+        title="Number of fireballs detected per year.",
+    )
+    fig_year.update_layout(width=1350, height=600)
+
+    # Recorded fireballs without location
+    fireballs_no_loc = df[np.isnan(df["lon"])].groupby(df["date"].dt.year)["date"].count()
+    fig_no_loc = px.bar(
+        fireballs_no_loc,
+        labels={"index": "year", "value": "Occurrences"},
+        title="Recorded fireballs without location.",
+    )
+    fig_no_loc.update_layout(width=1350, height=600)
+
+    return {
+        "fireball_energy_hist": fig_energy,
+        "fireball_impact_energy_hist": fig_impact_energy,
+        "fireballs_per_year": fig_year,
+        "fireball_missing_locations": fig_no_loc,
+    }
+
+
+def fireball_map_figure(df: pd.DataFrame) -> go.Figure:
+    """Create the map of the located fireballs sized by their energy.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe returned by `gather_fireball_data`.
+
+    Returns
+    -------
+    go.Figure
+        Scatter map figure.
+    """
+    # Convert lat and lon to follow standard latitude and longitude values
+    df_map = add_signed_coordinates(df).assign(
+        size=np.log(df["energy"] + 1) * 1.25,
+        year=df["date"].dt.year,
+        month=df["date"].dt.month,
+        day=df["date"].dt.day,
+    )
+    df_map = df_map.dropna(subset=["latitude", "longitude"])
+
+    fig_map = px.scatter_mapbox(
+        df_map,
+        lat="latitude",
+        lon="longitude",
+        size="size",
+        hover_name="date",
+        hover_data={"energy": True, "impact-e": True, "year": True, "month": True, "day": True},
+        title="Fireball recorded impacts sorted by energy values.",
+        zoom=1,
+        height=1100,
+        width=1000,
+    )
+    fig_map.update_layout(mapbox_style="open-street-map")
+    return fig_map
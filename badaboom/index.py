@@ -0,0 +1,147 @@
+"""Module providing an index to query fireball events by location and by date.
+
+Locations are indexed with a KD-tree over unit-sphere coordinates and dates with a sorted array,
+so queries do not need to scan the whole catalogue.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from badaboom.parsers.fireballs import add_signed_coordinates
+
+EARTH_RADIUS_KM = 6371.0088  # mean earth radius
+
+
+def _to_unit_sphere(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """Convert latitudes and longitudes in degrees to cartesian coordinates on the unit sphere."""
+    latitude = np.radians(latitude)
+    longitude = np.radians(longitude)
+    return np.column_stack(
+        (
+            np.cos(latitude) * np.cos(longitude),
+            np.cos(latitude) * np.sin(longitude),
+            np.sin(latitude),
+        )
+    )
+
+
+def _chord_to_km(chord: np.ndarray) -> np.ndarray:
+    """Convert chord lengths on the unit sphere to great-circle distances in kilometers."""
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1))
+
+
+class FireballIndex:
+    """Index over fireball events to answer spatial and temporal queries.
+
+    The fireballs are sorted by date and stored in the df variable with additional signed
+    `latitude` and `longitude` columns. All queries return sub-dataframes of it.
+    Fireballs without location are only available with time-window queries.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        """Build the spatial and temporal indexes.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Dataframe returned by `gather_fireball_data`.
+        """
+        self.df = add_signed_coordinates(df).sort_values("date", kind="stable")
+        self.df.reset_index(drop=True, inplace=True)
+        self._dates = self.df["date"].to_numpy(dtype="datetime64[ns]")
+
+        latitude = self.df["latitude"].to_numpy(dtype=float)
+        longitude = self.df["longitude"].to_numpy(dtype=float)
+        self._located_rows = np.flatnonzero(~(np.isnan(latitude) | np.isnan(longitude)))
+        self._tree = cKDTree(
+            _to_unit_sphere(latitude[self._located_rows], longitude[self._located_rows])
+        )
+
+    def radius(self, latitude: float, longitude: float, radius_km: float) -> pd.DataFrame:
+        """Return fireballs within radius_km of a point, sorted by distance.
+
+        Parameters
+        ----------
+        latitude : float
+            Latitude of the point in degrees, positive to the north.
+        longitude : float
+            Longitude of the point in degrees, positive to the east.
+        radius_km : float
+            Great-circle radius of the query in kilometers.
+
+        Returns
+        -------
+        pd.DataFrame
+            Matching fireballs with an additional `distance_km` column.
+        """
+        point = _to_unit_sphere(np.array([latitude]), np.array([longitude]))[0]
+        chord_radius = 2 * np.sin(min(radius_km / EARTH_RADIUS_KM, np.pi) / 2)
+        tree_rows = np.asarray(self._tree.query_ball_point(point, chord_radius), dtype=int)
+        distances = _chord_to_km(np.linalg.norm(self._tree.data[tree_rows] - point, axis=1))
+
+        order = np.argsort(distances, kind="stable")
+        return self.df.iloc[self._located_rows[tree_rows[order]]].assign(
+            distance_km=distances[order]
+        )
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> pd.DataFrame:
+        """Return the k fireballs nearest to a point, sorted by distance.
+
+        Parameters
+        ----------
+        latitude : float
+            Latitude of the point in degrees, positive to the north.
+        longitude : float
+            Longitude of the point in degrees, positive to the east.
+        k : int, optional
+            Number of fireballs to return, by default 1
+
+        Returns
+        -------
+        pd.DataFrame
+            Nearest fireballs with an additional `distance_km` column.
+        """
+        k = min(k, len(self._located_rows))
+        if k < 1:
+            return self.df.iloc[[]].assign(distance_km=np.array([], dtype=float))
+
+        point = _to_unit_sphere(np.array([latitude]), np.array([longitude]))[0]
+        chords, tree_rows = self._tree.query(point, k=k)
+        return self.df.iloc[self._located_rows[np.atleast_1d(tree_rows)]].assign(
+            distance_km=_chord_to_km(np.atleast_1d(chords))
+        )
+
+    def time_window(
+        self, start, end, min_energy: float | None = None, min_impact_energy: float | None = None
+    ) -> pd.DataFrame:
+        """Return fireballs that occurred between start and end (both included).
+
+        Parameters
+        ----------
+        start : datetime-like
+            Beginning of the time window.
+        end : datetime-like
+            End of the time window.
+        min_energy : float | None, optional
+            If set, only keep fireballs with an energy (in giga joules) at least equal to it,
+            by default None
+        min_impact_energy : float | None, optional
+            If set, only keep fireballs with an impact energy (in kilotons) at least equal to it,
+            by default None
+
+        Returns
+        -------
+        pd.DataFrame
+            Matching fireballs sorted by date.
+        """
+        begin_row = np.searchsorted(self._dates, np.datetime64(pd.Timestamp(start)), side="left")
+        end_row = np.searchsorted(self._dates, np.datetime64(pd.Timestamp(end)), side="right")
+        selected_df = self.df.iloc[begin_row:end_row]
+
+        if min_energy is not None:
+            selected_df = selected_df[selected_df["energy"] >= min_energy]
+        if min_impact_energy is not None:
+            selected_df = selected_df[selected_df["impact-e"] >= min_impact_energy]
+
+        return selected_df
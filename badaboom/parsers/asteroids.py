@@ -3,6 +3,7 @@ This module provides a parser to gather data from the 'Asteroids - NeoWs' databa
 Sources of the database: https://api.nasa.gov/
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from os.path import exists
 from time import sleep
 
@@ -20,6 +21,10 @@ class AsteroidDatasetParser:
     The first dataframe will store the events registered (in the df_neo_feed variable).
     The second dataframe will store the asteroid information (in the df_asteroids variable).
     These two dataframes can be joined using the asteroid ID.
+
+    Asteroids can also be enriched with their orbital data (in the df_asteroid_details variable)
+    and their full close approach history (in the df_close_approaches variable), both joinable
+    using the asteroid ID, see `enrich_asteroids`.
     """
 
     def __init__(
@@ -28,6 +33,8 @@ class AsteroidDatasetParser:
         local_neo_feed_datapath: str = "neo_feed_data.csv",
         local_asteroid_datapath: str = "asteroid_data.csv",
         api_location: str = "https://api.nasa.gov/neo/rest/v1/",
+        local_asteroid_details_datapath: str = "asteroid_details_data.parquet",
+        local_close_approach_datapath: str = "close_approach_data.parquet",
     ) -> None:
         """Prepare queries and load local data if it exists.
 
@@ -41,11 +48,22 @@ class AsteroidDatasetParser:
             Path where the asteroids dataframe will be saved/loaded, by default "asteroid_data.csv"
         api_location : _type_, optional
             Url to the 'Asteroids - NeoWs' API, by default "https://api.nasa.gov/neo/rest/v1/"
+        local_asteroid_details_datapath : str, optional
+            Path where the asteroid details dataframe will be saved/loaded,
+            by default "asteroid_details_data.parquet"
+        local_close_approach_datapath : str, optional
+            Path where the close approaches dataframe will be saved/loaded,
+            by default "close_approach_data.parquet"
         """
         self.api_location = api_location
         self.api_key = api_key
         self.local_neo_feed_datapath = local_neo_feed_datapath
         self.local_asteroid_datapath = local_asteroid_datapath
+        self.local_asteroid_details_datapath = local_asteroid_details_datapath
+        self.local_close_approach_datapath = local_close_approach_datapath
+        self.version = 0  # incremented each time the local dataframes are updated
+        self.year_versions = {}  # incremented each time the events of a year are updated
+        self.empty_years = set()  # years downloaded without any event, not downloaded again
 
         # Do a dummy request to check the remaining requests available
         query = f"feed?start_date=2015-12-30&end_date=2015-12-30&api_key={api_key}"
@@ -62,22 +80,33 @@ class AsteroidDatasetParser:
             self.df_asteroids = pd.read_csv(self.local_asteroid_datapath)
             self.known_asteroids = self.df_asteroids["asteroid_id"].to_list()
 
-    def retrieve_year_dataframe(self, year: int):
+        # load existing enrichment dataframes, stored as parquet files
+        if not exists(self.local_asteroid_details_datapath):
+            self.df_asteroid_details = pd.DataFrame([], columns=self.asteroid_details_desc)
+        else:
+            self.df_asteroid_details = pd.read_parquet(self.local_asteroid_details_datapath)
+
+        if not exists(self.local_close_approach_datapath):
+            self.df_close_approaches = pd.DataFrame([], columns=self.close_approaches_desc)
+        else:
+            self.df_close_approaches = pd.read_parquet(self.local_close_approach_datapath)
+
+    def retrieve_year_dataframe(self, year: int, refresh_estimations: bool = True):
         """Return dataframe_corresponding to year.
 
         Download the data if required and save it in the local database is required.
+        If refresh_estimations is False, a year already in the local database is not downloaded
+        again even if it contains estimations.
+        A year downloaded without any event is not downloaded again.
         """
         begin_year = pd.Timestamp(year=year, month=1, day=1)
         end_year = pd.Timestamp(year=year, month=12, day=31)
 
-        selected_df_neo_feed = self.df_neo_feed[
-            (self.df_neo_feed["date"] >= begin_year) & (self.df_neo_feed["date"] <= end_year)
-        ]
-        selected_df_asteroids = self.df_asteroids[
-            self.df_asteroids["asteroid_id"].isin(selected_df_neo_feed["asteroid_id"])
-        ]
+        selected_df_neo_feed, selected_df_asteroids = self.select_year_dataframe(year)
 
-        if len(selected_df_neo_feed) <= 0 or selected_df_neo_feed["is_estimation"].any():
+        if (len(selected_df_neo_feed) <= 0 and year not in self.empty_years) or (
+            refresh_estimations and selected_df_neo_feed["is_estimation"].any()
+        ):
             # remove year data if any to be safe about estimations
             index_to_remove = self.df_neo_feed[
                 (self.df_neo_feed["date"] >= begin_year) & (self.df_neo_feed["date"] <= end_year)
@@ -96,17 +125,281 @@ class AsteroidDatasetParser:
                 if end_date > end_year:
                     end_date = end_year
 
-            self.df_neo_feed.to_csv(self.local_neo_feed_datapath, sep=",", index=False)
-            self.df_asteroids.to_csv(self.local_asteroid_datapath, sep=",", index=False)
+            self._save_local_dataframes()
 
-            selected_df_neo_feed = self.df_neo_feed[
-                (self.df_neo_feed["date"] >= begin_year) & (self.df_neo_feed["date"] <= end_year)
+            selected_df_neo_feed, selected_df_asteroids = self.select_year_dataframe(year)
+            if len(selected_df_neo_feed) <= 0:
+                self.empty_years.add(year)
+
+        return selected_df_neo_feed, selected_df_asteroids
+
+    def select_year_dataframe(self, year: int):
+        """Return dataframes corresponding to year from the local database, without downloading."""
+        begin_year = pd.Timestamp(year=year, month=1, day=1)
+        end_year = pd.Timestamp(year=year, month=12, day=31)
+
+        selected_df_neo_feed = self.df_neo_feed[
+            (self.df_neo_feed["date"] >= begin_year) & (self.df_neo_feed["date"] <= end_year)
+        ]
+        selected_df_asteroids = self.df_asteroids[
+            self.df_asteroids["asteroid_id"].isin(selected_df_neo_feed["asteroid_id"])
+        ]
+        return selected_df_neo_feed, selected_df_asteroids
+
+    @property
+    def local_years(self) -> list[int]:
+        """Returns the sorted list of years with events in the local database."""
+        if len(self.df_neo_feed) <= 0:
+            return []
+        return sorted(int(year) for year in self.df_neo_feed["date"].dt.year.unique())
+
+    def refresh_stale_weeks(self) -> int:
+        """Download again the weeks containing estimated events that are now in the past.
+
+        Returns
+        -------
+        int
+            Number of weeks downloaded.
+        """
+        today_timestamp = pd.Timestamp.today().normalize()
+        stale_dates = (
+            self.df_neo_feed.loc[
+                self.df_neo_feed["is_estimation"].astype(bool)
+                & (self.df_neo_feed["date"] < today_timestamp),
+                "date",
+            ]
+            .sort_values()
+            .unique()
+        )
+
+        nb_weeks = 0
+        end_date = None
+        for stale_date in stale_dates:
+            if end_date is not None and stale_date <= end_date:
+                continue  # already downloaded with the previous week
+
+            start_date = pd.Timestamp(stale_date)
+            end_date = start_date + pd.Timedelta(days=6)
+            index_to_remove = self.df_neo_feed[
+                (self.df_neo_feed["date"] >= start_date) & (self.df_neo_feed["date"] <= end_date)
+            ].index
+            self.df_neo_feed.drop(index_to_remove, inplace=True)
+            self._download_week_information(start_date, end_date)
+            nb_weeks += 1
+
+        if nb_weeks > 0:
+            self._save_local_dataframes()
+
+        return nb_weeks
+
+    def enrich_asteroids(
+        self,
+        asteroid_ids: list[int] | None = None,
+        max_workers: int = 8,
+        max_age: pd.Timedelta | None = None,
+        force: bool = False,
+        max_retries: int = 3,
+    ) -> int:
+        """Download the orbital data and close approach history of asteroids.
+
+        Each asteroid needs one request to the lookup endpoint of the API. Asteroids already
+        enriched are skipped, requests are done concurrently by batches of at most
+        4 * max_workers within the remaining number of requests, and the results are saved after
+        each batch. Asteroids that failed because of a network or server error are retried at the
+        end.
+
+        Parameters
+        ----------
+        asteroid_ids : list[int] | None, optional
+            IDs of the asteroids to enrich, by default None (all asteroids of df_asteroids)
+        max_workers : int, optional
+            Maximum number of concurrent requests, by default 8
+        max_age : pd.Timedelta | None, optional
+            If set, asteroids enriched longer ago than max_age are downloaded again,
+            by default None
+        force : bool, optional
+            If True, all asteroids are downloaded again, by default False
+        max_retries : int, optional
+            Maximum number of retries of an asteroid after a network or server error,
+            by default 3
+
+        Returns
+        -------
+        int
+            Number of asteroids enriched.
+        """
+        if asteroid_ids is None:
+            asteroid_ids = self.df_asteroids["asteroid_id"]
+        asteroid_ids = pd.unique(pd.Series(asteroid_ids, dtype="int64"))
+
+        if not force:
+            up_to_date = self.df_asteroid_details
+            if max_age is not None:
+                up_to_date = up_to_date[
+                    up_to_date["retrieved_on"] >= pd.Timestamp.today() - pd.Timedelta(max_age)
+                ]
+            asteroid_ids = asteroid_ids[~np.isin(asteroid_ids, up_to_date["asteroid_id"])]
+
+        nb_enriched = 0
+        nb_failures = {}
+        pending_ids = list(asteroid_ids)
+        while len(pending_ids) > 0:
+            if self.remaining_requests < 1:
+                print("You have reached your hourly number of requests possible.")
+                print("The program will pause for 1 hour to be able to retrieve the data.")
+                sleep(3600)
+                self.remaining_requests = max_workers  # probe the new limit with a small batch
+
+            # small batches so that results are saved regularly
+            batch_size = min(self.remaining_requests, 4 * max_workers)
+            batch_ids = pending_ids[:batch_size]
+            pending_ids = pending_ids[batch_size:]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(self._download_asteroid_information, batch_ids))
+
+            # responses without rate limit header keep the previous count, minus the batch
+            remaining_list = [result[1] for result in results if result[1] is not None]
+            if len(remaining_list) > 0:
+                self.remaining_requests = min(remaining_list)
+            else:
+                self.remaining_requests -= len(batch_ids)
+
+            retried_ids = []
+            for asteroid_id, result in zip(batch_ids, results, strict=True):
+                if result[0] is None or result[0] >= 500:
+                    nb_failures[asteroid_id] = nb_failures.get(asteroid_id, 0) + 1
+                    if nb_failures[asteroid_id] <= max_retries:
+                        retried_ids.append(asteroid_id)
+                    else:
+                        print(f"Asteroid {asteroid_id} skipped after {max_retries} retries.")
+            # asteroids refused because of the rate limit are retried after the pause
+            pending_ids = (
+                [
+                    asteroid_id
+                    for asteroid_id, result in zip(batch_ids, results, strict=True)
+                    if result[0] == 429
+                ]
+                + pending_ids
+                + retried_ids
+            )
+
+            details_list = [result[2] for result in results if result[2] is not None]
+            close_approaches_list = [
+                close_approach
+                for result in results
+                if result[2] is not None
+                for close_approach in result[3]
             ]
-            selected_df_asteroids = self.df_asteroids[
-                self.df_asteroids["asteroid_id"].isin(selected_df_neo_feed["asteroid_id"])
+            if len(details_list) > 0:
+                self._update_asteroid_details(details_list, close_approaches_list)
+                nb_enriched += len(details_list)
+
+        return nb_enriched
+
+    def _download_asteroid_information(self, asteroid_id: int) -> tuple:
+        """Download the information of one asteroid with the lookup endpoint of the API.
+
+        Returns the status code (None if the request raised an exception), the remaining number
+        of requests (None if unknown), the asteroid details (None if the request failed) and the
+        list of its close approaches.
+        """
+        try:
+            r = requests.get(self.api_location + f"neo/{asteroid_id}?api_key={self.api_key}")
+        except requests.RequestException as e:
+            print(f"Asteroid {asteroid_id} could not be retrieved ({e}).")
+            return None, None, None, []
+
+        remaining_requests = r.headers.get("X-RateLimit-Remaining")
+        if remaining_requests is not None:
+            remaining_requests = int(remaining_requests)
+        if r.status_code != 200:
+            if r.status_code != 429:
+                print(f"Asteroid {asteroid_id} could not be retrieved (error {r.status_code}).")
+            return r.status_code, remaining_requests, None, []
+
+        asteroid_dict = r.json()
+        orbital_data = asteroid_dict.get("orbital_data", {})
+
+        def _orbital_float(key: str) -> float:
+            # this information is sometimes missing
+            value = orbital_data.get(key)
+            return float(value) if value is not None else np.nan
+
+        details = [
+            asteroid_id,
+            orbital_data.get("orbit_id"),
+            pd.Timestamp(orbital_data["orbit_determination_date"])
+            if "orbit_determination_date" in orbital_data
+            else pd.NaT,
+            orbital_data.get("first_observation_date"),
+            orbital_data.get("last_observation_date"),
+            _orbital_float("data_arc_in_days"),
+            _orbital_float("observations_used"),
+            _orbital_float("orbit_uncertainty"),
+            _orbital_float("minimum_orbit_intersection"),
+            _orbital_float("jupiter_tisserand_invariant"),
+            _orbital_float("epoch_osculation"),
+            _orbital_float("eccentricity"),
+            _orbital_float("semi_major_axis"),
+            _orbital_float("inclination"),
+            _orbital_float("ascending_node_longitude"),
+            _orbital_float("orbital_period"),
+            _orbital_float("perihelion_distance"),
+            _orbital_float("perihelion_argument"),
+            _orbital_float("aphelion_distance"),
+            _orbital_float("perihelion_time"),
+            _orbital_float("mean_anomaly"),
+            _orbital_float("mean_motion"),
+            orbital_data.get("orbit_class", {}).get("orbit_class_type"),
+            pd.Timestamp.today(),
+        ]
+        close_approaches = [
+            [
+                asteroid_id,
+                pd.Timestamp(close_approach["close_approach_date"]),
+                close_approach["orbiting_body"],
+                float(close_approach["relative_velocity"]["kilometers_per_second"]),
+                float(close_approach["miss_distance"]["kilometers"]),
             ]
+            for close_approach in asteroid_dict.get("close_approach_data", [])
+        ]
+        return r.status_code, remaining_requests, details, close_approaches
 
-        return selected_df_neo_feed, selected_df_asteroids
+    def _update_asteroid_details(self, details_list: list, close_approaches_list: list) -> None:
+        """Replace the enrichment of the given asteroids and save the enrichment dataframes."""
+        df_details = pd.DataFrame(details_list, columns=self.asteroid_details_desc)
+        df_close_approaches = pd.DataFrame(
+            close_approaches_list, columns=self.close_approaches_desc
+        )
+
+        # keep the rows of the other asteroids, empty dataframes are skipped to keep the dtypes
+        enriched_ids = df_details["asteroid_id"]
+        kept_df_details = self.df_asteroid_details[
+            ~self.df_asteroid_details["asteroid_id"].isin(enriched_ids)
+        ]
+        if len(kept_df_details) > 0:
+            df_details = pd.concat([kept_df_details, df_details], ignore_index=True)
+        self.df_asteroid_details = df_details.sort_values(by="asteroid_id", ignore_index=True)
+
+        kept_df_close_approaches = self.df_close_approaches[
+            ~self.df_close_approaches["asteroid_id"].isin(enriched_ids)
+        ]
+        if len(kept_df_close_approaches) > 0:
+            df_close_approaches = pd.concat(
+                [kept_df_close_approaches, df_close_approaches], ignore_index=True
+            )
+        self.df_close_approaches = df_close_approaches.sort_values(
+            by=["asteroid_id", "date"], ignore_index=True
+        )
+
+        self.df_asteroid_details.to_parquet(self.local_asteroid_details_datapath, index=False)
+        self.df_close_approaches.to_parquet(self.local_close_approach_datapath, index=False)
+        self.version += 1
+
+    def _save_local_dataframes(self) -> None:
+        """Save the dataframes to their local paths."""
+        self.df_neo_feed.to_csv(self.local_neo_feed_datapath, sep=",", index=False)
+        self.df_asteroids.to_csv(self.local_asteroid_datapath, sep=",", index=False)
 
     @property
     def local_df_neo_feed(self) -> pd.DataFrame:
@@ -201,15 +494,22 @@ class AsteroidDatasetParser:
                     )
 
         # update local df, it supposes the new week does not exist in the local dataframes
+        # empty local dataframes are not concatenated to keep the dtypes of the new rows
         df_events = pd.DataFrame(events_list, columns=self.events_desc)
-        self.df_neo_feed = pd.concat([self.df_neo_feed, df_events], ignore_index=True).sort_values(
-            by="date"
-        )
+        if len(self.df_neo_feed) > 0:
+            df_events = pd.concat([self.df_neo_feed, df_events], ignore_index=True)
+        self.df_neo_feed = df_events.sort_values(by="date")
         if len(asteroids_list_to_add) > 0:
             df_asteroids_to_add = pd.DataFrame(asteroids_list_to_add, columns=self.asteroids_desc)
-            self.df_asteroids = pd.concat(
-                [self.df_asteroids, df_asteroids_to_add], ignore_index=True
-            ).sort_values(by="asteroid_id")
+            if len(self.df_asteroids) > 0:
+                df_asteroids_to_add = pd.concat(
+                    [self.df_asteroids, df_asteroids_to_add], ignore_index=True
+                )
+            self.df_asteroids = df_asteroids_to_add.sort_values(by="asteroid_id")
+
+        self.version += 1
+        for year in {start_date.year, end_date.year}:
+            self.year_versions[year] = self.year_versions.get(year, 0) + 1
 
     @property
     def events_desc(self) -> tuple[str]:
@@ -238,3 +538,44 @@ class AsteroidDatasetParser:
             "estimated_diameter_min",  # in kilometers
             "estimated_diameter_max",  # in kilometers
         )
+
+    @property
+    def asteroid_details_desc(self) -> tuple[str]:
+        """Return a tuple of string describing the asteroid details."""
+        return (
+            "asteroid_id",
+            "orbit_id",
+            "orbit_determination_date",
+            "first_observation_date",
+            "last_observation_date",
+            "data_arc_in_days",
+            "observations_used",
+            "orbit_uncertainty",
+            "minimum_orbit_intersection",  # in astronomical units
+            "jupiter_tisserand_invariant",
+            "epoch_osculation",  # in julian days
+            "eccentricity",
+            "semi_major_axis",  # in astronomical units
+            "inclination",  # in degrees
+            "ascending_node_longitude",  # in degrees
+            "orbital_period",  # in days
+            "perihelion_distance",  # in astronomical units
+            "perihelion_argument",  # in degrees
+            "aphelion_distance",  # in astronomical units
+            "perihelion_time",  # in julian days
+            "mean_anomaly",  # in degrees
+            "mean_motion",  # in degrees per day
+            "orbit_class_type",
+            "retrieved_on",
+        )
+
+    @property
+    def close_approaches_desc(self) -> tuple[str]:
+        """Return a tuple of string describing the close approaches of the asteroid details."""
+        return (
+            "asteroid_id",
+            "date",
+            "orbiting_body",
+            "relative_velocity_kms",
+            "miss_distance",
+        )  # velocity in kilometers per secondes and distance in kilometers
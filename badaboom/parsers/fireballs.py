@@ -5,6 +5,7 @@ More information there: https://ssd-api.jpl.nasa.gov/doc/fireball.html
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import requests
 
@@ -49,3 +50,26 @@ def gather_fireball_data(
     df = pd.DataFrame(casted_data, columns=database_json["fields"])
     df["energy"] = df["energy"] * 10
     return df
+
+
+def add_signed_coordinates(df: pd.DataFrame) -> pd.DataFrame:
+    """Add standard signed latitude and longitude values to a fireball dataframe.
+
+    The API gives unsigned `lat` and `lon` values with their direction in `lat-dir` ("N" or "S")
+    and `lon-dir` ("E" or "W").
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Dataframe returned by `gather_fireball_data`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Copy of the dataframe with additional `latitude` and `longitude` columns in degrees.
+        Fireballs without location have NaN values.
+    """
+    return df.assign(
+        latitude=np.where(df["lat-dir"] == "N", 1.0, -1.0) * df["lat"],
+        longitude=np.where(df["lon-dir"] == "E", 1.0, -1.0) * df["lon"],
+    )
@@ -0,0 +1,290 @@
+"""Module providing a local HTTP server answering queries over in-memory NASA data.
+
+The asteroid and fireball datasets are loaded once, refreshed on a schedule and shared by all
+clients. Responses are cached per dataset version and carry an ETag.
+
+Available endpoints (all dates are ISO formatted):
+
+- `/summary`
+- `/events?start=<date>&end=<date>`: asteroid close approaches.
+- `/asteroids/<asteroid_id>`: asteroid information with its close approaches.
+- `/fireballs?start=<date>&end=<date>&min_energy=<GJ>`
+- `/fireballs/near?lat=<degrees>&lon=<degrees>&radius_km=<km>` or `&k=<count>`
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from badaboom.index import FireballIndex
+from badaboom.parsers.asteroids import AsteroidDatasetParser
+from badaboom.parsers.fireballs import gather_fireball_data
+
+
+class _Snapshot(NamedTuple):
+    """Immutable view of the datasets served, replaced as a whole at each refresh."""
+
+    version: int
+    df_neo_feed: pd.DataFrame
+    neo_feed_dates: np.ndarray
+    df_asteroids: pd.DataFrame
+    fireball_index: FireballIndex
+    refreshed_at: pd.Timestamp
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    """Convert a dataframe to JSON serializable records."""
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def _isoformat(timestamp) -> str | None:
+    """Return the ISO format of a timestamp, None if it is missing."""
+    return None if pd.isna(timestamp) else pd.Timestamp(timestamp).isoformat()
+
+
+class DatasetStore:
+    """Keep the asteroid and fireball datasets in memory and answer queries over them.
+
+    Queries are answered from a snapshot of the datasets so a refresh never blocks them.
+    """
+
+    def __init__(
+        self,
+        asteroid_parser: AsteroidDatasetParser,
+        fireball_loader: Callable[[], pd.DataFrame] = gather_fireball_data,
+        cache_size: int = 1024,
+    ) -> None:
+        """Load the datasets.
+
+        Parameters
+        ----------
+        asteroid_parser : AsteroidDatasetParser
+            Parser providing the asteroid datasets.
+        fireball_loader : Callable[[], pd.DataFrame], optional
+            Function returning the fireball dataframe, by default gather_fireball_data
+        cache_size : int, optional
+            Maximum number of responses cached, by default 1024
+        """
+        self.asteroid_parser = asteroid_parser
+        self.fireball_loader = fireball_loader
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._version = 0
+        self._snapshot = None
+        self._df_fireballs = None
+        self.refresh(refresh_stale_weeks=False)
+
+    @property
+    def version(self) -> int:
+        """Returns the version of the datasets served."""
+        return self._snapshot.version
+
+    def refresh(self, refresh_stale_weeks: bool = True) -> None:
+        """Update stale weeks and fireballs, then serve the new data if anything changed.
+
+        Parameters
+        ----------
+        refresh_stale_weeks : bool, optional
+            If True, weeks with outdated estimations are downloaded again, by default True
+        """
+        with self._refresh_lock:
+            asteroid_version = self.asteroid_parser.version
+            if refresh_stale_weeks:
+                self.asteroid_parser.refresh_stale_weeks()
+
+            df_fireballs = self.fireball_loader()
+            if (
+                self._snapshot is not None
+                and self.asteroid_parser.version == asteroid_version
+                and df_fireballs.equals(self._df_fireballs)
+            ):
+                return
+
+            df_neo_feed = self.asteroid_parser.df_neo_feed.sort_values("date", kind="stable")
+            df_neo_feed.reset_index(drop=True, inplace=True)
+            self._df_fireballs = df_fireballs
+            self._version += 1
+            self._snapshot = _Snapshot(
+                version=self._version,
+                df_neo_feed=df_neo_feed,
+                neo_feed_dates=df_neo_feed["date"].to_numpy(dtype="datetime64[ns]"),
+                df_asteroids=self.asteroid_parser.df_asteroids.copy(),
+                fireball_index=FireballIndex(df_fireballs),
+                refreshed_at=pd.Timestamp.now(),
+            )
+
+        with self._cache_lock:
+            self._cache.clear()
+
+    def respond(self, url: str, if_none_match: str | None = None) -> tuple[int, bytes, str | None]:
+        """Answer a query.
+
+        Parameters
+        ----------
+        url : str
+            Path of the query with its parameters.
+        if_none_match : str | None, optional
+            Value of the If-None-Match header of the request, by default None
+
+        Returns
+        -------
+        tuple[int, bytes, str | None]
+            HTTP status, JSON body and ETag of the response.
+        """
+        snapshot = self._snapshot
+        key = (snapshot.version, url)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+
+        if cached is None:
+            split_url = urlsplit(url)
+            params = {name: values[-1] for name, values in parse_qs(split_url.query).items()}
+            try:
+                status, payload = self._query(snapshot, split_url.path.rstrip("/"), params)
+            except (KeyError, ValueError) as e:
+                status, payload = 400, {"error": f"Invalid parameter: {e}"}
+
+            body = json.dumps(payload).encode("utf-8")
+            etag = f'"{snapshot.version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+            cached = (status, body, etag)
+            if status == 200:
+                with self._cache_lock:
+                    self._cache[key] = cached
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+
+        status, body, etag = cached
+        if status == 200 and if_none_match == etag:
+            return 304, b"", etag
+
+        return cached
+
+    def _query(self, snapshot: _Snapshot, path: str, params: dict[str, str]) -> tuple[int, object]:
+        """Compute the payload of a query."""
+        if path == "/summary":
+            df_neo_feed = snapshot.df_neo_feed
+            df_fireballs = snapshot.fireball_index.df
+            return 200, {
+                "version": snapshot.version,
+                "refreshed_at": snapshot.refreshed_at.isoformat(),
+                "events": len(df_neo_feed),
+                "asteroids": len(snapshot.df_asteroids),
+                "potentially_hazardous_events": int(
+                    df_neo_feed["is_potentially_hazardous_asteroid"].astype(bool).sum()
+                ),
+                "events_first_date": _isoformat(df_neo_feed["date"].min()),
+                "events_last_date": _isoformat(df_neo_feed["date"].max()),
+                "fireballs": len(df_fireballs),
+                "fireballs_first_date": _isoformat(df_fireballs["date"].min()),
+                "fireballs_last_date": _isoformat(df_fireballs["date"].max()),
+            }
+
+        if path == "/events":
+            begin_row = np.searchsorted(
+                snapshot.neo_feed_dates, np.datetime64(pd.Timestamp(params["start"])), "left"
+            )
+            end_row = np.searchsorted(
+                snapshot.neo_feed_dates, np.datetime64(pd.Timestamp(params["end"])), "right"
+            )
+            return 200, _records(snapshot.df_neo_feed.iloc[begin_row:end_row])
+
+        if path.startswith("/asteroids/"):
+            asteroid_id = int(path.removeprefix("/asteroids/"))
+            df_asteroid = snapshot.df_asteroids[snapshot.df_asteroids["asteroid_id"] == asteroid_id]
+            if len(df_asteroid) == 0:
+                return 404, {"error": f"Unknown asteroid {asteroid_id}"}
+
+            df_events = snapshot.df_neo_feed[snapshot.df_neo_feed["asteroid_id"] == asteroid_id]
+            return 200, {**_records(df_asteroid)[0], "events": _records(df_events)}
+
+        if path == "/fireballs":
+            min_energy = float(params["min_energy"]) if "min_energy" in params else None
+            return 200, _records(
+                snapshot.fireball_index.time_window(params["start"], params["end"], min_energy)
+            )
+
+        if path == "/fireballs/near":
+            latitude, longitude = float(params["lat"]), float(params["lon"])
+            if "radius_km" in params:
+                df = snapshot.fireball_index.radius(latitude, longitude, float(params["radius_km"]))
+            else:
+                df = snapshot.fireball_index.nearest(latitude, longitude, int(params.get("k", 1)))
+            return 200, _records(df)
+
+        return 404, {"error": f"Unknown endpoint {path}"}
+
+
+def _make_handler(store: DatasetStore) -> type[BaseHTTPRequestHandler]:
+    """Return a request handler class answering queries with the given store."""
+
+    class DatasetRequestHandler(BaseHTTPRequestHandler):
+        """Request handler forwarding GET queries to the store."""
+
+        def do_GET(self) -> None:
+            """Answer a GET query."""
+            status, body, etag = store.respond(self.path, self.headers.get("If-None-Match"))
+            self.send_response(status)
+            if etag is not None:
+                self.send_header("ETag", etag)
+                self.send_header("Cache-Control", "no-cache")
+            if status != 304:
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if status != 304:
+                self.wfile.write(body)
+
+    return DatasetRequestHandler
+
+
+def serve(
+    store: DatasetStore,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    refresh_interval: float = 3600,
+) -> None:
+    """Serve the store over HTTP until interrupted, refreshing it on a schedule.
+
+    Parameters
+    ----------
+    store : DatasetStore
+        Store answering the queries.
+    host : str, optional
+        Address to listen on, by default "127.0.0.1"
+    port : int, optional
+        Port to listen on, by default 8000
+    refresh_interval : float, optional
+        Number of seconds between two refreshes of the store, by default 3600
+    """
+    stop_event = threading.Event()
+
+    def _refresh_loop() -> None:
+        while not stop_event.wait(refresh_interval):
+            try:
+                store.refresh()
+            except Exception as e:  # keep serving the previous data
+                print(f"Refresh failed: {e}")
+
+    refresh_thread = threading.Thread(target=_refresh_loop, daemon=True)
+    refresh_thread.start()
+
+    with ThreadingHTTPServer((host, port), _make_handler(store)) as httpd:
+        print(f"Serving on http://{host}:{port}")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stop_event.set()
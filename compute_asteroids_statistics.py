@@ -6,9 +6,14 @@ import argparse
 from datetime import datetime
 
 import pandas as pd
-import plotly.graph_objects as go
 from tqdm import tqdm
 
+from badaboom.figures import (
+    asteroid_events_figure,
+    asteroid_size_figure,
+    asteroid_year_statistics,
+    export_figures,
+)
 from badaboom.parsers.asteroids import AsteroidDatasetParser
 
 
@@ -18,6 +23,8 @@ def main(
     fn_figure_asteroid_size: str,
     start_year: int = 1980,
     end_year: int = 2030,
+    folder_results: str = ".",
+    compress: bool = False,
 ) -> None:
     """Retrieve information (from start_year to en_year), do all figures and compute some
     information.
@@ -34,6 +41,10 @@ def main(
         Year to start from, by default 1980
     end_year : int, optional
         Year to end the computation, by default 2030
+    folder_results : str, optional
+        Folder where the resulting figures will be generated, by default "."
+    compress : bool, optional
+        If True, figures are written gzip compressed, by default False
     """
     adp = AsteroidDatasetParser(api_key)
 
@@ -41,157 +52,25 @@ def main(
     years = list(
         range(start_year, end_year + 1)
     )  # first registered year 1899; no data are available before
-    nunique_asteroid_per_year = []
-    nunique_events_per_year = []
-    min_dist_per_year = []
-    poten_hazardous_events_per_year = []
-    small_asteroids = []
-    medium_asteroids = []
-    big_asteroids = []
-    enormous_asteroids = []
-    gigantic_asteroids = []
+    statistics_per_year = []
 
     pbar = tqdm(years)
     for year in pbar:
         pbar.set_description(f"Processing year {year}", refresh=True)
-        res = adp.retrieve_year_dataframe(year)
+        year_neo_feed_df, year_asteroid_df = adp.retrieve_year_dataframe(year)
+        statistics_per_year.append(asteroid_year_statistics(year_neo_feed_df, year_asteroid_df))
 
-        year_neo_feed_df, year_asteroid_df = res
-        nunique_asteroid_per_year.append(year_neo_feed_df["asteroid_id"].nunique())
-        nunique_events_per_year.append(year_neo_feed_df.shape[0])
-        min_dist_per_year.append(year_neo_feed_df["miss_distance"].min())
-        poten_hazardous_events_per_year.append(
-            year_neo_feed_df["is_potentially_hazardous_asteroid"].sum()
-        )
-        small_asteroids.append(
-            year_asteroid_df[year_asteroid_df["estimated_diameter_max"] < 0.1].shape[0]
-        )
-        medium_asteroids.append(
-            year_asteroid_df[
-                (year_asteroid_df["estimated_diameter_max"] >= 0.1)
-                & (year_asteroid_df["estimated_diameter_max"] < 0.5)
-            ].shape[0]
-        )
-        big_asteroids.append(
-            year_asteroid_df[
-                (year_asteroid_df["estimated_diameter_max"] >= 0.5)
-                & (year_asteroid_df["estimated_diameter_max"] < 1.0)
-            ].shape[0]
-        )
-        enormous_asteroids.append(
-            year_asteroid_df[
-                (year_asteroid_df["estimated_diameter_max"] >= 1.0)
-                & (year_asteroid_df["estimated_diameter_max"] < 2.0)
-            ].shape[0]
-        )
-        gigantic_asteroids.append(
-            year_asteroid_df[year_asteroid_df["estimated_diameter_max"] >= 2.0].shape[0]
-        )
-
-    # Figures generation
-    # Figure 1
+    df_statistics = pd.DataFrame(statistics_per_year, index=years)
     today_timestamp = pd.Timestamp.today()
 
-    # Creating the figure
-    fig = go.Figure()
-
-    # Adding bars for the number of unique events per year
-    fig.add_trace(
-        go.Bar(
-            x=years,
-            y=nunique_events_per_year,
-            name="Number of unique events per year",
-            marker_color="firebrick",
-        )
-    )
-
-    # Adding bars for the number of unique asteroids per year
-    fig.add_trace(
-        go.Bar(
-            x=years,
-            y=nunique_asteroid_per_year,
-            name="Number of unique asteroids per year",
-            marker_color="grey",
-        )
-    )
-
-    # Updating the layout
-    fig.update_layout(
-        title=f"Past and future asteroids events. Produced on {today_timestamp.date()}",
-        xaxis=dict(title="Years"),
-        yaxis=dict(title="Count"),
-        barmode="group",
-        bargap=0.15,  # Gap between bars of adjacent location coordinates.
-        bargroupgap=0.1,  # Gap between bars of the same location coordinates.
-        legend=dict(x=0.1, y=1.1, orientation="h"),
-    )
-
-    # Saving the figure to an HTML file
-    fig.write_html(f"{fn_figure_events}.html")
-
-    # Figure 2
-    # Creating the figure
-    fig = go.Figure()
-
-    # Adding stacked bars
-    fig.add_trace(
-        go.Bar(
-            x=years,
-            y=small_asteroids,
-            name="Asteroids with max diameter < 100m",
-            marker_color="grey",
-        )
-    )
-
-    fig.add_trace(
-        go.Bar(
-            x=years,
-            y=medium_asteroids,
-            name="Asteroids with max diameter ≥ 100m and < 500m",
-            marker_color="firebrick",
-        )
-    )
-
-    fig.add_trace(
-        go.Bar(
-            x=years,
-            y=big_asteroids,
-            name="Asteroids with max diameter ≥ 500m and < 1km",
-            marker_color="blue",
-        )
-    )
-
-    fig.add_trace(
-        go.Bar(
-            x=years,
-            y=enormous_asteroids,
-            name="Asteroids with max diameter ≥ 1km and < 2km",
-            marker_color="black",
-        )
-    )
-
-    fig.add_trace(
-        go.Bar(
-            x=years,
-            y=gigantic_asteroids,
-            name="Asteroids with max diameter ≥ 2km",
-            marker_color="red",
-        )
-    )
-
-    # Updating the layout
-    fig.update_layout(
-        title="Past and future asteroids events sorted by size."
-        f" Produced on {today_timestamp.date()}",
-        xaxis=dict(title="Years"),
-        yaxis=dict(title="Count"),
-        barmode="stack",
-        legend=dict(x=0.1, y=1.1, orientation="h"),
-        hovermode="x unified",
-    )
+    # Figures generation
+    figures = {
+        fn_figure_events: asteroid_events_figure(df_statistics),
+        fn_figure_asteroid_size: asteroid_size_figure(df_statistics),
+    }
 
-    # Saving the figure to an HTML file
-    fig.write_html(f"{fn_figure_asteroid_size}.html")
+    # Saving the figures to HTML files
+    export_figures(figures, folder_results, compress)
 
     # Some information
     begin_date = pd.Timestamp(year=start_year, month=1, day=1)
@@ -280,6 +159,17 @@ if __name__ == "__main__":
         default="Figure 2 - asteroid size per year",
         help="Filename of the outputted figure for the number of asteroid size per year.",
     )
+    parser.add_argument(
+        "--folder_results",
+        type=str,
+        default=".",
+        help="Folder where the resulting figures will be.",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write the resulting figures gzip compressed.",
+    )
 
     args = parser.parse_args()
     main(
@@ -288,4 +178,6 @@ if __name__ == "__main__":
         args.fn_figure_asteroid_size,
         args.starting_year,
         args.last_year,
+        args.folder_results,
+        args.compress,
     )
@@ -0,0 +1,151 @@
+"""Interactive dashboard over the 'Asteroids - NeoWs' and fireball databases provided by NASA.
+
+Run it with: `streamlit run dashboard.py` (the NASA API key is read from NASA_API_KEY).
+
+Moving the slider never downloads anything: only the years of the local database are shown, and
+missing years are downloaded on demand with a button. The statistics of each year are cached with
+the version of that year in the local database, so moving the slider only computes the new years
+and a download only invalidates the years it updated.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from badaboom.figures import (
+    asteroid_events_figure,
+    asteroid_size_figure,
+    asteroid_year_statistics,
+    fireball_figures,
+    fireball_map_figure,
+)
+from badaboom.index import FireballIndex
+from badaboom.parsers.asteroids import AsteroidDatasetParser
+from badaboom.parsers.fireballs import gather_fireball_data
+
+NEO_FEED_DATAPATH = "neo_feed_data.csv"
+ASTEROID_DATAPATH = "asteroid_data.csv"
+
+
+@st.cache_resource
+def load_asteroid_parser(
+    local_neo_feed_datapath: str, local_asteroid_datapath: str
+) -> tuple[AsteroidDatasetParser, threading.Lock]:
+    """Return the asteroid parser shared by all sessions and the lock protecting it.
+
+    There is one parser per local database, so sessions never write the same files concurrently.
+    """
+    adp = AsteroidDatasetParser(
+        os.environ.get("NASA_API_KEY", "DEMO_KEY"),
+        local_neo_feed_datapath,
+        local_asteroid_datapath,
+    )
+    return adp, threading.Lock()
+
+
+@st.cache_resource(ttl=3600)
+def load_fireball_index() -> FireballIndex:
+    """Return the fireball index shared by all sessions, reloaded every hour."""
+    return FireballIndex(gather_fireball_data())
+
+
+@st.cache_data(max_entries=16)
+def local_years(_adp: AsteroidDatasetParser, _lock: threading.Lock, version: int) -> set[int]:
+    """Return the years of the local database."""
+    with _lock:
+        return set(_adp.local_years)
+
+
+@st.cache_data(max_entries=1024)
+def year_statistics(
+    _adp: AsteroidDatasetParser, _lock: threading.Lock, year: int, year_version: int
+) -> dict[str, float]:
+    """Return the statistics of a year of the local database."""
+    with _lock:
+        year_neo_feed_df, year_asteroid_df = _adp.select_year_dataframe(year)
+    return asteroid_year_statistics(year_neo_feed_df, year_asteroid_df)
+
+
+@st.cache_data(max_entries=64)
+def fireball_range_figures(
+    _index: FireballIndex, start_year: int, end_year: int, version: str
+) -> dict:
+    """Return the fireball figures of the fireballs between start_year and end_year."""
+    df = _index.time_window(
+        pd.Timestamp(year=start_year, month=1, day=1),
+        pd.Timestamp(year=end_year + 1, month=1, day=1) - pd.Timedelta(microseconds=1),
+    )
+    figures = fireball_figures(df)
+    figures["fireball_map"] = fireball_map_figure(df)
+    return figures
+
+
+def main() -> None:
+    """Render the dashboard."""
+    st.set_page_config(page_title="Badaboom", layout="wide")
+    st.title("Badaboom")
+
+    start_year, end_year = st.sidebar.slider(
+        "Years",
+        min_value=1900,  # first registered year 1899; no data are available before
+        max_value=2100,
+        value=(1980, datetime.now().year),
+    )
+    mapbox_token = st.sidebar.text_input("MapBox token (optional)", type="password")
+    if mapbox_token:
+        px.set_mapbox_access_token(mapbox_token)
+
+    adp, lock = load_asteroid_parser(NEO_FEED_DATAPATH, ASTEROID_DATAPATH)
+    if st.sidebar.button("Refresh past estimations"):
+        with lock:
+            nb_weeks = adp.refresh_stale_weeks()
+        st.sidebar.write(f"{nb_weeks} weeks downloaded again.")
+
+    # downloads only happen on demand, the statistics are computed once the years are loaded
+    years = range(start_year, end_year + 1)
+    missing_years = [
+        year
+        for year in years
+        if year not in local_years(adp, lock, adp.version) and year not in adp.empty_years
+    ]
+    if len(missing_years) > 0:
+        st.sidebar.write(f"{len(missing_years)} years of the range are not stored locally.")
+        if st.sidebar.button("Download missing years"):
+            progress_bar = st.sidebar.progress(0.0)
+            for i, year in enumerate(missing_years):
+                with lock:
+                    adp.retrieve_year_dataframe(year, refresh_estimations=False)
+                progress_bar.progress((i + 1) / len(missing_years), text=f"Year {year}")
+
+    stored_years = [year for year in years if year in local_years(adp, lock, adp.version)]
+
+    asteroids_tab, fireballs_tab = st.tabs(["Asteroids", "Fireballs"])
+
+    with asteroids_tab:
+        if len(stored_years) <= 0:
+            st.write("No year of the range is stored locally.")
+        else:
+            statistics_per_year = []
+            for year in stored_years:
+                year_version = adp.year_versions.get(year, 0)
+                statistics_per_year.append(year_statistics(adp, lock, year, year_version))
+            df_statistics = pd.DataFrame(statistics_per_year, index=stored_years)
+
+            st.metric("Events", int(df_statistics["nunique_events"].sum()))
+            st.plotly_chart(asteroid_events_figure(df_statistics), use_container_width=True)
+            st.plotly_chart(asteroid_size_figure(df_statistics), use_container_width=True)
+
+    with fireballs_tab:
+        index = load_fireball_index()
+        version = f"{len(index.df)}-{index.df['date'].max()}"
+        figures = fireball_range_figures(index, start_year, end_year, version)
+        for fig in figures.values():
+            st.plotly_chart(fig, use_container_width=True)
+
+
+if __name__ == "__main__":
+    main()
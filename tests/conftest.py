@@ -1 +1,28 @@
-"""TODO: Module providing all fixtures for testing."""
+"""Module providing all fixtures for testing."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def fireballs_df():
+    """Fixture providing a small fireball dataframe as returned by gather_fireball_data."""
+    return pd.DataFrame(
+        {
+            "date": [
+                datetime(2021, 3, 1),
+                datetime(2020, 1, 1),
+                datetime(2021, 1, 1),
+                datetime(2022, 1, 1),
+            ],
+            "energy": [10.0, 2.0, 50.0, 3.0],
+            "impact-e": [0.1, 0.08, 0.5, 0.09],
+            "lat": [48.8, 48.9, 33.9, np.nan],
+            "lat-dir": ["N", "N", "S", None],
+            "lon": [2.3, 2.4, 151.2, np.nan],
+            "lon-dir": ["E", "E", "E", None],
+        }
+    )
@@ -0,0 +1,263 @@
+"""Tests of the 'Asteroids - NeoWs' parser."""
+
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+import requests
+
+from badaboom.parsers.asteroids import AsteroidDatasetParser
+
+sample_lookup_response = {
+    "id": "2000433",
+    "orbital_data": {
+        "orbit_id": "659",
+        "orbit_determination_date": "2021-05-24 17:55:05",
+        "eccentricity": ".2229512647434284",
+        "semi_major_axis": "1.458045729081037",
+        "orbit_class": {"orbit_class_type": "AMO"},
+    },
+    "close_approach_data": [
+        {
+            "close_approach_date": "1900-12-27",
+            "relative_velocity": {"kilometers_per_second": "5.5786191875"},
+            "miss_distance": {"kilometers": "47112732.928149391"},
+            "orbiting_body": "Earth",
+        },
+        {
+            "close_approach_date": "1907-11-05",
+            "relative_velocity": {"kilometers_per_second": "4.4299996092"},
+            "miss_distance": {"kilometers": "70533232.893794389"},
+            "orbiting_body": "Mars",
+        },
+    ],
+}
+
+
+sample_feed_response = {
+    "near_earth_objects": {
+        "2021-12-30": [
+            {
+                "id": "2000433",
+                "neo_reference_id": "2000433",
+                "name": "433 Eros (A898 PA)",
+                "nasa_jpl_url": "https://ssd.jpl.nasa.gov/tools/sbdb_lookup.html#/?sstr=2000433",
+                "absolute_magnitude_h": 10.31,
+                "is_potentially_hazardous_asteroid": False,
+                "is_sentry_object": False,
+                "close_approach_data": [
+                    {
+                        "relative_velocity": {"kilometers_per_second": "5.5786191875"},
+                        "miss_distance": {"kilometers": "47112732.928149391"},
+                    }
+                ],
+            }
+        ]
+    }
+}
+
+
+class MockResponse:
+    """Mock of the responses of the 'Asteroids - NeoWs' API."""
+
+    def __init__(self, url: str) -> None:
+        """Prepare the response of the url."""
+        self.url = url
+        self.status_code = 404 if "neo/404" in url else 200
+        self.headers = {"X-RateLimit-Remaining": "1000"}
+
+    def json(self) -> dict:
+        """Return the content of the response."""
+        if "feed?" in self.url:
+            return sample_feed_response
+        return sample_lookup_response
+
+
+class RateLimitedMockResponse(MockResponse):
+    """Mock of a lookup response refused because the hourly limit is reached."""
+
+    def __init__(self, url: str) -> None:
+        """Prepare the refused response of the url."""
+        super().__init__(url)
+        self.status_code = 429
+        self.headers = {"X-RateLimit-Remaining": "0"}
+
+
+class UnavailableMockResponse(MockResponse):
+    """Mock of a lookup response refused by an unavailable server, without rate limit header."""
+
+    def __init__(self, url: str) -> None:
+        """Prepare the refused response of the url."""
+        super().__init__(url)
+        self.status_code = 503
+        self.headers = {}
+
+
+class EmptyFeedMockResponse(MockResponse):
+    """Mock of a feed response without any event."""
+
+    def json(self) -> dict:
+        """Return the content of the response."""
+        return {"near_earth_objects": {}}
+
+
+def create_parser(tmp_path) -> AsteroidDatasetParser:
+    """Create a parser storing its data in a temporary folder."""
+    with patch("requests.get", side_effect=MockResponse):
+        return AsteroidDatasetParser(
+            "DEMO_KEY",
+            local_neo_feed_datapath=str(tmp_path / "neo_feed_data.csv"),
+            local_asteroid_datapath=str(tmp_path / "asteroid_data.csv"),
+            local_asteroid_details_datapath=str(tmp_path / "asteroid_details_data.parquet"),
+            local_close_approach_datapath=str(tmp_path / "close_approach_data.parquet"),
+        )
+
+
+@pytest.fixture
+def parser(tmp_path):
+    """Fixture providing a parser storing its data in a temporary folder."""
+    return create_parser(tmp_path)
+
+
+def test_enrich_asteroids(parser, tmp_path):
+    """Asteroids should be enriched once, and the results saved locally."""
+    with patch("requests.get", side_effect=MockResponse) as mock_get:
+        nb_enriched = parser.enrich_asteroids([2000433, 2000433, 3000000, 404])
+
+        assert nb_enriched == 2, "Duplicated and missing asteroids should not be enriched."
+        assert mock_get.call_count == 3, "Each asteroid should be requested once."
+        assert list(parser.df_asteroid_details["asteroid_id"]) == [2000433, 3000000]
+        row = parser.df_asteroid_details.iloc[0]
+        assert row["eccentricity"] == pytest.approx(0.2229512647434284), "Eccentricity is wrong."
+        assert row["orbit_class_type"] == "AMO", "Orbit class is incorrect."
+        assert pd.isna(row["inclination"]), "Missing orbital data should be NaN."
+        assert len(parser.df_close_approaches) == 4, "Close approaches are incorrect."
+
+        assert parser.enrich_asteroids([2000433, 3000000]) == 0, "Nothing should be downloaded."
+        assert mock_get.call_count == 3, "Enriched asteroids should not be requested again."
+
+        assert parser.enrich_asteroids([2000433], force=True) == 1, "Forced enrichment failed."
+        assert len(parser.df_close_approaches) == 4, "Close approaches should be replaced."
+
+    reloaded_parser = create_parser(tmp_path)
+    assert len(reloaded_parser.df_asteroid_details) == 2, "Details should be saved locally."
+    assert len(reloaded_parser.df_close_approaches) == 4, "Close approaches should be saved."
+    assert pd.api.types.is_datetime64_any_dtype(
+        reloaded_parser.df_asteroid_details["retrieved_on"]
+    ), "Dates should keep their type."
+
+    (tmp_path / "close_approach_data.parquet").unlink()
+    reloaded_parser = create_parser(tmp_path)
+    assert len(reloaded_parser.df_asteroid_details) == 2, "Details should be loaded alone."
+    assert len(reloaded_parser.df_close_approaches) == 0, "No close approaches are saved."
+
+
+def test_enrich_asteroids_max_age(parser):
+    """Only asteroids enriched longer ago than max_age should be downloaded again."""
+    with patch("requests.get", side_effect=MockResponse) as mock_get:
+        parser.enrich_asteroids([2000433, 3000000])
+        parser.df_asteroid_details.loc[
+            parser.df_asteroid_details["asteroid_id"] == 3000000, "retrieved_on"
+        ] = pd.Timestamp.today() - pd.Timedelta(days=60)
+
+        nb_enriched = parser.enrich_asteroids([2000433, 3000000], max_age=pd.Timedelta(days=30))
+
+        assert nb_enriched == 1, "Only the outdated asteroid should be enriched."
+        assert mock_get.call_args.args[0].split("?")[0].endswith("neo/3000000")
+    retrieved_on = parser.df_asteroid_details.set_index("asteroid_id")["retrieved_on"]
+    assert retrieved_on[3000000] > pd.Timestamp.today() - pd.Timedelta(days=1), "Not refreshed."
+
+
+def test_enrich_asteroids_rate_limit(parser):
+    """Asteroids refused by the rate limit should be retried after a pause."""
+    responses = iter([RateLimitedMockResponse, MockResponse])
+
+    with (
+        patch("requests.get", side_effect=lambda url: next(responses)(url)) as mock_get,
+        patch("badaboom.parsers.asteroids.sleep") as mock_sleep,
+    ):
+        nb_enriched = parser.enrich_asteroids([2000433])
+
+    assert nb_enriched == 1, "The asteroid should be enriched after the pause."
+    assert mock_get.call_count == 2, "The refused asteroid should be requested again."
+    mock_sleep.assert_called_once_with(3600)
+    assert parser.remaining_requests == 1000, "Remaining requests should be updated."
+
+
+def test_enrich_asteroids_server_errors(parser):
+    """Server errors without rate limit header should be retried without pausing."""
+    responses = [UnavailableMockResponse, MockResponse]
+    with patch("requests.get", side_effect=lambda url: responses.pop(0)(url)):
+        with patch("badaboom.parsers.asteroids.sleep") as mock_sleep:
+            nb_enriched = parser.enrich_asteroids([2000433])
+
+    mock_sleep.assert_not_called()
+    assert nb_enriched == 1, "The asteroid should be retried after the server error."
+    assert parser.remaining_requests == 1000, "The remaining requests should be updated."
+
+
+def test_enrich_asteroids_network_errors(parser):
+    """An exception should only fail its own asteroid, which is retried later."""
+
+    def mock_get(url: str) -> MockResponse:
+        if "neo/1?" in url and mock_get.nb_failures < 2:
+            mock_get.nb_failures += 1
+            raise requests.ConnectionError("Connection reset")
+        return MockResponse(url)
+
+    mock_get.nb_failures = 0
+    with patch("requests.get", side_effect=mock_get):
+        nb_enriched = parser.enrich_asteroids([1, 2000433, 404], max_retries=3)
+
+    assert nb_enriched == 2, "Both available asteroids should be enriched."
+    assert set(parser.df_asteroid_details["asteroid_id"]) == {
+        1,
+        2000433,
+    }, "Asteroids are incorrect."
+
+
+def test_enrich_asteroids_max_retries(parser):
+    """An asteroid failing more than max_retries times should be skipped."""
+    with patch("requests.get", side_effect=requests.ConnectionError("Connection reset")) as m:
+        nb_enriched = parser.enrich_asteroids([2000433], max_retries=2)
+
+    assert nb_enriched == 0, "No asteroid should be enriched."
+    assert m.call_count == 3, "The asteroid should be requested once then retried twice."
+
+
+def test_year_versions(parser):
+    """Downloading a week should only update the versions of the years it covers."""
+    with patch("requests.get", side_effect=MockResponse):
+        parser._download_week_information(pd.Timestamp("2021-12-30"), pd.Timestamp("2022-01-05"))
+        parser._download_week_information(pd.Timestamp("2022-01-06"), pd.Timestamp("2022-01-12"))
+
+    assert parser.year_versions == {2021: 1, 2022: 2}, "Year versions are incorrect."
+    assert parser.version == 2, "The global version should count every update."
+
+
+def test_empty_year_downloaded_once(parser):
+    """A year without any event should only be downloaded once."""
+    with patch("requests.get", side_effect=EmptyFeedMockResponse) as mock_get:
+        parser.retrieve_year_dataframe(1850)
+        nb_requests = mock_get.call_count
+        year_neo_feed_df, _ = parser.retrieve_year_dataframe(1850)
+
+    assert nb_requests > 0, "The year should have been downloaded the first time."
+    assert mock_get.call_count == nb_requests, "An empty year should not be downloaded again."
+    assert len(year_neo_feed_df) == 0, "The year should not contain any event."
+    assert parser.local_years == [], "An empty year should not be a local year."
+
+
+def test_select_year_dataframe(parser):
+    """Selecting a year should never download it."""
+    with patch("requests.get", side_effect=MockResponse) as mock_get:
+        year_neo_feed_df, year_asteroid_df = parser.select_year_dataframe(2021)
+        assert mock_get.call_count == 0, "Selecting a missing year should not download it."
+        assert len(year_neo_feed_df) == 0, "A missing year should not contain any event."
+
+        parser._download_week_information(pd.Timestamp("2021-12-30"), pd.Timestamp("2022-01-05"))
+        year_neo_feed_df, year_asteroid_df = parser.select_year_dataframe(2021)
+
+    assert len(year_neo_feed_df) == 1, "The downloaded event should be selected."
+    assert len(year_asteroid_df) == 1, "The asteroid of the event should be selected."
+    assert parser.local_years == [2021], "Local years are incorrect."
@@ -0,0 +1,44 @@
+"""Tests of the fireballs and close approaches cross-match."""
+
+import pandas as pd
+import pytest
+
+from badaboom.crossmatch import match_fireballs_to_close_approaches
+
+
+@pytest.fixture
+def neo_feed_df():
+    """Fixture providing a small close approach dataframe."""
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2020-12-31", "2021-01-03", "2021-01-01", "2021-06-01"]),
+            "asteroid_id": [1, 2, 3, 4],
+            "miss_distance": [1e6, 2e6, 3e7, 4e6],
+        }
+    )
+
+
+def test_match(fireballs_df, neo_feed_df):
+    """Close approaches within one day of a fireball should be matched."""
+    df_asteroids = pd.DataFrame({"asteroid_id": [1, 2, 3, 4], "asteroid_name": list("abcd")})
+
+    df_pairs = match_fireballs_to_close_approaches(fireballs_df, neo_feed_df, df_asteroids)
+
+    assert list(df_pairs["asteroid_id"]) == [3, 1], "Pairs should be sorted by time delta."
+    assert list(df_pairs["asteroid_name"]) == ["c", "a"], "Asteroid attributes are missing."
+    assert list(df_pairs["time_delta"]) == [
+        pd.Timedelta(0),
+        pd.Timedelta(days=1),
+    ], "Time deltas are incorrect."
+    assert (df_pairs["energy"] == 50.0).all(), "Fireball attributes are missing."
+
+
+def test_match_streamed(fireballs_df, neo_feed_df):
+    """Streaming the feed by chunks should give the same pairs, filtered by miss distance."""
+    chunks = (neo_feed_df.iloc[[i]] for i in range(len(neo_feed_df)))
+
+    df_pairs = match_fireballs_to_close_approaches(
+        fireballs_df, chunks, window="2D", max_miss_distance=1e7
+    )
+
+    assert list(df_pairs["asteroid_id"]) == [1, 2], "Streamed pairs are incorrect."
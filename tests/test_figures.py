@@ -0,0 +1,58 @@
+"""Tests of the figures export helpers."""
+
+import gzip
+from os.path import exists, join
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from badaboom.figures import asteroid_year_statistics, export_figures
+
+
+def test_export_figures(tmp_path):
+    """Figures should reference one shared plotly.js bundle instead of embedding it."""
+    figures = {f"figure_{i}": go.Figure(go.Bar(x=[1, 2], y=[i, i + 1])) for i in range(3)}
+
+    written_files = export_figures(figures, str(tmp_path))
+
+    assert written_files[0] == join(str(tmp_path), "plotly.min.js"), "Bundle should be first."
+    assert len(written_files) == len(figures) + 1, "One file per figure plus the bundle."
+    with open(written_files[0]) as f:
+        bundle_size = len(f.read())
+    for filename in figures:
+        with open(join(str(tmp_path), f"{filename}.html")) as f:
+            html = f.read()
+        assert 'src="plotly.min.js"' in html, "The shared bundle should be referenced."
+        assert len(html) < bundle_size, "The bundle should not be embedded."
+
+
+def test_export_figures_compressed(tmp_path):
+    """Compressed mode should only write gzip files."""
+    export_figures({"figure": go.Figure()}, str(tmp_path), compress=True)
+
+    assert not exists(join(str(tmp_path), "figure.html")), "Uncompressed file should not exist."
+    with gzip.open(join(str(tmp_path), "figure.html.gz"), "rt") as f:
+        assert 'src="plotly.min.js"' in f.read(), "The shared bundle should be referenced."
+    assert exists(join(str(tmp_path), "plotly.min.js.gz")), "The bundle should be compressed."
+
+
+def test_asteroid_year_statistics():
+    """Asteroids should be counted in their size category."""
+    year_neo_feed_df = pd.DataFrame(
+        {
+            "asteroid_id": [1, 1, 2],
+            "miss_distance": [3e6, 1e6, 2e6],
+            "is_potentially_hazardous_asteroid": [True, True, False],
+        }
+    )
+    year_asteroid_df = pd.DataFrame({"asteroid_id": [1, 2], "estimated_diameter_max": [0.05, 1.5]})
+
+    statistics = asteroid_year_statistics(year_neo_feed_df, year_asteroid_df)
+
+    assert statistics["nunique_asteroids"] == 2, "Number of unique asteroids is incorrect."
+    assert statistics["nunique_events"] == 3, "Number of events is incorrect."
+    assert statistics["min_distance"] == 1e6, "Minimum distance is incorrect."
+    assert statistics["potentially_hazardous_events"] == 2, "Hazardous events are incorrect."
+    assert statistics["small_asteroids"] == 1, "Small asteroids are incorrect."
+    assert statistics["enormous_asteroids"] == 1, "Enormous asteroids are incorrect."
+    assert statistics["medium_asteroids"] == 0, "Medium asteroids are incorrect."
@@ -0,0 +1,46 @@
+"""Tests of the fireball index."""
+
+from datetime import datetime
+
+from badaboom.index import FireballIndex
+
+
+def test_radius(fireballs_df):
+    """Only fireballs around Paris should be returned, closest first."""
+    index = FireballIndex(fireballs_df)
+
+    result = index.radius(48.85, 2.35, 50)
+
+    assert set(result["date"]) == {
+        datetime(2020, 1, 1),
+        datetime(2021, 3, 1),
+    }, "Paris fireballs should be returned."
+    assert result["distance_km"].is_monotonic_increasing, "Results should be sorted by distance."
+    assert (result["distance_km"] < 50).all(), "Distances should be within the radius."
+
+
+def test_nearest(fireballs_df):
+    """The signed coordinates should be used, Sydney is in the southern hemisphere."""
+    index = FireballIndex(fireballs_df)
+
+    result = index.nearest(-33.87, 151.21, k=1)
+
+    assert len(result) == 1, "Only one fireball should be returned."
+    assert result.iloc[0]["date"] == datetime(2021, 1, 1), "The Sydney fireball is expected."
+    assert result.iloc[0]["distance_km"] < 10, "Distance to Sydney is incorrect."
+    assert len(index.nearest(0, 0, k=10)) == 3, "Fireballs without location are not indexed."
+
+
+def test_time_window(fireballs_df):
+    """Time window queries should include both bounds and filter energy."""
+    index = FireballIndex(fireballs_df)
+
+    result = index.time_window("2021-01-01", "2022-01-01")
+    assert list(result["date"]) == [
+        datetime(2021, 1, 1),
+        datetime(2021, 3, 1),
+        datetime(2022, 1, 1),
+    ], "Dates in the window should be returned sorted."
+
+    result = index.time_window("2020-01-01", "2022-01-01", min_energy=5)
+    assert list(result["energy"]) == [50.0, 10.0], "Energy filter is incorrect."
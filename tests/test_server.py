@@ -0,0 +1,69 @@
+"""Tests of the dataset store used by the local server."""
+
+import json
+
+import pandas as pd
+import pytest
+
+from badaboom.server import DatasetStore
+
+
+class FakeAsteroidParser:
+    """Parser serving fixed dataframes without any request to NASA."""
+
+    def __init__(self) -> None:
+        """Prepare the dataframes."""
+        self.version = 0
+        self.df_neo_feed = pd.DataFrame(
+            {
+                "date": pd.to_datetime(["2021-01-03", "2021-01-01", "2021-02-01"]),
+                "asteroid_id": [1, 2, 1],
+                "is_potentially_hazardous_asteroid": [True, False, True],
+                "miss_distance": [1e6, 2e6, 3e6],
+            }
+        )
+        self.df_asteroids = pd.DataFrame({"asteroid_id": [1, 2], "asteroid_name": ["a", "b"]})
+
+    def refresh_stale_weeks(self) -> int:
+        """Pretend one week was downloaded again."""
+        self.version += 1
+        return 1
+
+
+@pytest.fixture
+def store(fireballs_df):
+    """Fixture providing a store over fake datasets."""
+    return DatasetStore(FakeAsteroidParser(), lambda: fireballs_df)
+
+
+def test_queries(store):
+    """Queries should be answered from the in-memory datasets."""
+    status, body, _ = store.respond("/events?start=2021-01-01&end=2021-01-03")
+    assert status == 200, "The query should succeed."
+    assert [event["asteroid_id"] for event in json.loads(body)] == [2, 1], "Events are incorrect."
+
+    status, body, _ = store.respond("/asteroids/1")
+    asteroid = json.loads(body)
+    assert asteroid["asteroid_name"] == "a", "Asteroid information is incorrect."
+    assert len(asteroid["events"]) == 2, "Asteroid events are incorrect."
+
+    status, body, _ = store.respond("/summary")
+    assert json.loads(body)["fireballs"] == 4, "Summary is incorrect."
+
+    status, body, _ = store.respond("/fireballs/near?lat=48.85&lon=2.35&radius_km=50")
+    assert len(json.loads(body)) == 2, "Fireball radius query is incorrect."
+
+    assert store.respond("/asteroids/3")[0] == 404, "Unknown asteroids should not be found."
+    assert store.respond("/events?start=2021")[0] == 400, "Missing parameters should fail."
+
+
+def test_etag(store):
+    """ETags should change only when the datasets change."""
+    _, body, etag = store.respond("/summary")
+    assert store.respond("/summary", if_none_match=etag) == (304, b"", etag), "Not modified."
+
+    store.refresh(refresh_stale_weeks=False)
+    assert store.respond("/summary")[2] == etag, "Nothing changed, the ETag should be the same."
+
+    store.refresh()
+    assert store.respond("/summary")[2] != etag, "The ETag should change with the datasets."